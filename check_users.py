@@ -2,10 +2,9 @@
 Check all user accounts and test login
 """
 
-from werkzeug.security import check_password_hash
-
 from app import app
 from models import User, db
+from security import verify_password
 
 with app.app_context():
     print("\n" + "=" * 90)
@@ -24,7 +23,7 @@ with app.app_context():
 
     for user in users:
         # Check if password works
-        password_works = check_password_hash(user.password_hash, test_password)
+        password_works = verify_password(test_password, user.password_hash)
         pwd_display = "Password123" if password_works else "UNKNOWN"
 
         print(
@@ -45,7 +44,7 @@ with app.app_context():
         user = User.query.filter_by(username=username).first()
         if user:
             # Test with Password123
-            works = check_password_hash(user.password_hash, "Password123")
+            works = verify_password("Password123", user.password_hash)
             status = "✅ LOGIN WORKS" if works else "❌ LOGIN FAILED"
             print(f"{username:<20} Password123 → {status}")
         else:
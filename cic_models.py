@@ -29,9 +29,72 @@ Demonstrates how credit bureaus structure data for risk assessment
 and how financial institutions integrate with such systems.
 """
 
+import hashlib
 from datetime import datetime
 
-from models import db
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import validates
+
+from models import VND, db
+
+# ============================================================================
+# Column Types
+# ============================================================================
+
+
+def national_id_key(national_id: str) -> int:
+    """
+    Signed 64-bit BLAKE2b digest of a national ID.
+
+    CIC customers are looked up by national ID on every credit check and
+    report; probing a unique BIGINT index is cheaper than comparing
+    variable-length strings.
+    """
+    digest = hashlib.blake2b(national_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class CodeEnum(db.TypeDecorator):
+    """
+    One of a constants class's string values, stored as a SMALLINT code.
+
+    Classification columns (account status, payment status, ...) hold a
+    handful of fixed values; a 2-byte code keeps rows narrow and makes
+    equality filters integer compares. Python code keeps reading and
+    writing the string constants. Codes follow declaration order in the
+    constants class, so new values must only ever be appended.
+    """
+
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def __init__(self, constants):
+        super().__init__()
+        self.constants = constants
+        values = [value for name, value in vars(constants).items() if name.isupper()]
+        self._values = dict(enumerate(values, 1))
+        self._codes = {value: code for code, value in self._values.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(
+                f"{value!r} is not a valid {self.constants.__name__} value"
+            ) from None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._values[value]
+        except KeyError:
+            raise ValueError(
+                f"{value!r} is not a valid {self.constants.__name__} code"
+            ) from None
+
 
 # ============================================================================
 # CIC Status and Category Constants
@@ -142,39 +205,46 @@ class CICCustomer(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     # Identity Information (PII - Protected Data)
-    national_id = db.Column(
-        db.String(32), unique=True, nullable=False, index=True
-    )  # CCCD/CMND
+    national_id = db.Column(db.String(32), nullable=False)  # CCCD/CMND
+    # Fixed-width lookup key for national_id (see national_id_key); set
+    # automatically whenever national_id is assigned
+    national_id_hash = db.Column(db.BigInteger, unique=True, nullable=False)
     full_name = db.Column(db.String(128), nullable=False, index=True)
     date_of_birth = db.Column(db.Date, nullable=False)
     gender = db.Column(db.String(16), nullable=True)  # MALE / FEMALE / OTHER
     customer_type = db.Column(
-        db.String(32), nullable=False, default=CICCustomerType.INDIVIDUAL
+        CodeEnum(CICCustomerType), nullable=False, default=CICCustomerType.INDIVIDUAL
     )
 
     # Contact Information
     phone_number = db.Column(db.String(32), nullable=True)
     email = db.Column(db.String(128), nullable=True)
-    current_address = db.Column(db.Text, nullable=True)
-    permanent_address = db.Column(db.Text, nullable=True)
+    current_address = db.Column(db.String(256), nullable=True)
+    permanent_address = db.Column(db.String(256), nullable=True)
     province_city = db.Column(db.String(64), nullable=True)  # Ho Chi Minh, Hanoi, etc.
 
     # Employment & Income Information
-    employment_status = db.Column(db.String(32), nullable=True)
+    employment_status = db.Column(CodeEnum(CICEmploymentStatus), nullable=True)
     employer_name = db.Column(db.String(128), nullable=True)
     occupation = db.Column(db.String(128), nullable=True)
-    monthly_income = db.Column(db.Numeric(18, 2), nullable=True)  # VND
+    monthly_income = db.Column(VND, nullable=True)  # VND
     years_employed = db.Column(db.Integer, nullable=True)
 
     # Financial Summary (Calculated Fields - Updated Periodically)
-    total_credit_limit = db.Column(
-        db.Numeric(18, 2), default=0
-    )  # Total available credit
-    total_outstanding_debt = db.Column(db.Numeric(18, 2), default=0)  # Current debt
-    total_assets_value = db.Column(db.Numeric(18, 2), default=0)  # Declared assets
+    total_credit_limit = db.Column(VND, default=0)  # Total available credit
+    total_outstanding_debt = db.Column(VND, default=0)  # Current debt
+    total_assets_value = db.Column(VND, default=0)  # Declared assets
     number_of_active_accounts = db.Column(db.Integer, default=0)
     number_of_closed_accounts = db.Column(db.Integer, default=0)
     number_of_delinquent_accounts = db.Column(db.Integer, default=0)
+    # Debt / limit, NULL without revolving credit (stored generated column)
+    utilization_ratio = db.Column(
+        db.Float,
+        db.Computed(
+            "CAST(total_outstanding_debt AS REAL) / NULLIF(total_credit_limit, 0)",
+            persisted=True,
+        ),
+    )
 
     # Credit Score (CIC Proprietary Score - Similar to FICO)
     # Range: 300-900 (300-579: Poor, 580-669: Fair, 670-739: Good, 740-799: Very Good, 800-900: Excellent)
@@ -202,11 +272,46 @@ class CICCustomer(db.Model):
     first_credit_date = db.Column(
         db.DateTime, nullable=True
     )  # Date of first credit account
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # Risk flags are true for a small minority of customers, so each gets a
+    # partial index over the flagged rows only rather than a full boolean one.
+    __table_args__ = tuple(
+        db.Index(
+            f"ix_cust_{name}",
+            "id",
+            sqlite_where=db.text(name),
+            postgresql_where=db.text(name),
+        )
+        for name in (
+            "is_blacklisted",
+            "has_bankruptcy",
+            "has_court_judgment",
+            "has_debt_restructuring",
+        )
     )
 
+    @validates("national_id")
+    def _set_national_id_hash(self, key, national_id):
+        self.national_id_hash = national_id_key(national_id)
+        return national_id
+
+    @classmethod
+    def national_id_is(cls, national_id: str):
+        """
+        Filter clause matching one national ID via the hashed unique index.
+
+        The plain national_id comparison only runs on the row the index
+        returns and guards against a (practically impossible) hash collision.
+        """
+        return and_(
+            cls.national_id_hash == national_id_key(national_id),
+            cls.national_id == national_id,
+        )
+
     def __repr__(self):
         return f"<CICCustomer {self.national_id} - {self.full_name} (Score: {self.current_credit_score})>"
 
@@ -236,23 +341,19 @@ class CICCreditAccount(db.Model):
     lender_code = db.Column(db.String(32), nullable=True)  # Institution identifier
 
     # Account Details
-    account_type = db.Column(db.String(32), nullable=False)  # Loan type
+    account_type = db.Column(CodeEnum(CICAccountType), nullable=False)  # Loan type
     account_status = db.Column(
-        db.String(32), nullable=False, default=CICAccountStatus.ACTIVE
+        CodeEnum(CICAccountStatus), nullable=False, default=CICAccountStatus.ACTIVE
     )
     disbursement_date = db.Column(db.Date, nullable=True)  # When loan was given
     maturity_date = db.Column(db.Date, nullable=True)  # When loan should be paid off
     closure_date = db.Column(db.Date, nullable=True)  # When account was closed
 
     # Financial Details
-    original_loan_amount = db.Column(db.Numeric(18, 2), nullable=False)
-    current_balance = db.Column(
-        db.Numeric(18, 2), nullable=False
-    )  # Outstanding principal
-    credit_limit = db.Column(
-        db.Numeric(18, 2), nullable=True
-    )  # For revolving credit (credit cards)
-    monthly_payment = db.Column(db.Numeric(18, 2), nullable=True)
+    original_loan_amount = db.Column(VND, nullable=False)
+    current_balance = db.Column(VND, nullable=False)  # Outstanding principal
+    credit_limit = db.Column(VND, nullable=True)  # For revolving credit (credit cards)
+    monthly_payment = db.Column(VND, nullable=True)
     interest_rate = db.Column(db.Numeric(5, 2), nullable=True)  # Annual percentage rate
 
     # Performance Metrics
@@ -264,19 +365,27 @@ class CICCreditAccount(db.Model):
     on_time_payments = db.Column(db.Integer, default=0)
     late_payments = db.Column(db.Integer, default=0)
     missed_payments = db.Column(db.Integer, default=0)
+    # Stored generated ratio for the credit report, NULL until the first payment
+    on_time_ratio = db.Column(
+        db.Float,
+        db.Computed(
+            "CAST(on_time_payments AS REAL) / NULLIF(total_payments_made, 0)",
+            persisted=True,
+        ),
+    )
 
     # Collateral (if secured loan)
     is_secured = db.Column(db.Boolean, default=False)
     collateral_type = db.Column(
         db.String(64), nullable=True
     )  # House, car, deposit, etc.
-    collateral_value = db.Column(db.Numeric(18, 2), nullable=True)
+    collateral_value = db.Column(VND, nullable=True)
 
     # Timestamps
     last_payment_date = db.Column(db.Date, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationships
@@ -309,14 +418,14 @@ class CICPaymentHistory(db.Model):
     payment_due_date = db.Column(db.Date, nullable=False)
 
     # Payment Details
-    amount_due = db.Column(db.Numeric(18, 2), nullable=False)
-    amount_paid = db.Column(db.Numeric(18, 2), nullable=False)
+    amount_due = db.Column(VND, nullable=False)
+    amount_paid = db.Column(VND, nullable=False)
     payment_date = db.Column(db.Date, nullable=True)  # Actual payment date
     days_late = db.Column(db.Integer, default=0)
 
     # Status
     payment_status = db.Column(
-        db.String(32), nullable=False, default=CICPaymentStatus.ON_TIME
+        CodeEnum(CICPaymentStatus), nullable=False, default=CICPaymentStatus.ON_TIME
     )
 
     # Flags
@@ -324,11 +433,37 @@ class CICPaymentHistory(db.Model):
     is_settlement = db.Column(db.Boolean, default=False)  # Settled for less than owed
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     account = db.relationship("CICCreditAccount", backref="payment_history", lazy=True)
 
+    # Per-account history in period order; per-status counts for scoring
+    # (GROUP BY payment_status) read only the second index
+    __table_args__ = (
+        db.Index(
+            "ix_ph_acct_year_month", "account_id", "payment_year", "payment_month"
+        ),
+        db.Index("ix_ph_acct_status", "account_id", "payment_status"),
+    )
+
+    @classmethod
+    def bulk_load(cls, records):
+        """
+        Insert many payment records in one executemany.
+
+        Payment history arrives a month at a time for every account, so
+        this path skips the ORM unit of work (identity map, per-object
+        events) and sends plain column dicts straight to the driver.
+        Records must all have the same keys; created_at is filled in by
+        the database.
+
+        Args:
+            records: List of dicts of CICPaymentHistory column values
+        """
+        if records:
+            db.session.execute(insert(cls), records)
+
     def __repr__(self):
         return f"<CICPaymentHistory {self.payment_year}-{self.payment_month:02d} ({self.payment_status})>"
 
@@ -354,12 +489,12 @@ class CICAsset(db.Model):
     )
 
     # Asset Details
-    asset_type = db.Column(db.String(32), nullable=False)
+    asset_type = db.Column(CodeEnum(CICAssetType), nullable=False)
     asset_description = db.Column(db.String(256), nullable=True)
     asset_location = db.Column(db.String(256), nullable=True)  # For real estate
 
     # Valuation
-    estimated_value = db.Column(db.Numeric(18, 2), nullable=False)
+    estimated_value = db.Column(VND, nullable=False)
     valuation_date = db.Column(db.Date, nullable=False)
     valuation_method = db.Column(
         db.String(64), nullable=True
@@ -372,7 +507,7 @@ class CICAsset(db.Model):
     is_encumbered = db.Column(
         db.Boolean, default=False
     )  # Has existing loan/lien against it
-    encumbrance_amount = db.Column(db.Numeric(18, 2), nullable=True)  # Outstanding lien
+    encumbrance_amount = db.Column(VND, nullable=True)  # Outstanding lien
 
     # Documentation
     registration_number = db.Column(
@@ -381,16 +516,16 @@ class CICAsset(db.Model):
     acquisition_date = db.Column(db.Date, nullable=True)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationships
     customer = db.relationship("CICCustomer", backref="assets", lazy=True)
 
     def __repr__(self):
-        return f"<CICAsset {self.asset_type} - {self.estimated_value:,.0f} VND>"
+        return f"<CICAsset {self.asset_type} - {self.estimated_value} VND>"
 
 
 class CICInquiry(db.Model):
@@ -411,7 +546,7 @@ class CICInquiry(db.Model):
     )
 
     # Inquiry Details
-    inquiry_type = db.Column(db.String(32), nullable=False)
+    inquiry_type = db.Column(CodeEnum(CICInquiryType), nullable=False)
     inquiring_institution = db.Column(db.String(128), nullable=False)  # Bank name
     institution_code = db.Column(db.String(32), nullable=True)
     inquiry_purpose = db.Column(
@@ -422,15 +557,30 @@ class CICInquiry(db.Model):
     inquiry_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     # Context
-    loan_amount_requested = db.Column(
-        db.Numeric(18, 2), nullable=True
-    )  # How much customer applied for
+    loan_amount_requested = db.Column(VND, nullable=True)  # Amount applied for
 
     # Relationships
     customer = db.relationship("CICCustomer", backref="inquiries", lazy=True)
 
+    # The latest-inquiries list is a range scan on one customer's
+    # inquiry_date. inquiry_date also grows with insertion order, so on
+    # PostgreSQL a BRIN index (a few pages) serves bureau-wide date ranges;
+    # SQLite has no BRIN
+    __table_args__ = (
+        db.Index("ix_inq_cust_date", "customer_id", "inquiry_date"),
+        # Hard-inquiry window counts for scoring, answered from the index alone
+        db.Index(
+            "ix_inq_cust_type_date", "customer_id", "inquiry_type", "inquiry_date"
+        ),
+        db.Index("ix_inq_date_brin", "inquiry_date", postgresql_using="brin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
     def __repr__(self):
-        return f"<CICInquiry {self.inquiring_institution} - {self.inquiry_date.strftime('%Y-%m-%d')}>"
+        # inquiry_date is only filled in at flush time
+        inquiry_day = self.inquiry_date.date() if self.inquiry_date else None
+        return f"<CICInquiry {self.inquiring_institution} - {inquiry_day}>"
 
 
 class CICPublicRecord(db.Model):
@@ -464,18 +614,16 @@ class CICPublicRecord(db.Model):
     case_number = db.Column(db.String(64), nullable=True)
 
     # Financial Impact
-    amount = db.Column(
-        db.Numeric(18, 2), nullable=True
-    )  # Judgment amount, debt discharged
+    amount = db.Column(VND, nullable=True)  # Judgment amount, debt discharged
     resolution_date = db.Column(db.Date, nullable=True)
 
     # Description
     description = db.Column(db.Text, nullable=True)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationships
@@ -507,7 +655,7 @@ class CICCreditScoreHistory(db.Model):
 
     # Score Details
     score = db.Column(db.Integer, nullable=False)
-    score_date = db.Column(db.Date, nullable=False, index=True)
+    score_date = db.Column(db.Date, nullable=False)
     risk_category = db.Column(db.String(16), nullable=True)
 
     # Contributing Factors (Reason Codes)
@@ -515,10 +663,19 @@ class CICCreditScoreHistory(db.Model):
     secondary_factor = db.Column(db.String(128), nullable=True)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     customer = db.relationship("CICCustomer", backref="score_history", lazy=True)
 
+    # Latest scores for one customer (ORDER BY score_date DESC LIMIT n);
+    # bureau-wide date ranges use BRIN on PostgreSQL (see CICInquiry)
+    __table_args__ = (
+        db.Index("ix_score_cust_date", "customer_id", "score_date"),
+        db.Index("ix_score_date_brin", "score_date", postgresql_using="brin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
     def __repr__(self):
         return f"<CICCreditScoreHistory Score: {self.score} on {self.score_date}>"
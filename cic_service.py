@@ -50,16 +50,16 @@ Additional Vietnamese-specific factors:
 - Blacklist status
 """
 
-import json
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from cic_models import (
     CICAccountStatus,
-    CICAsset,
+    CICAccountType,
     CICCreditAccount,
     CICCreditScoreHistory,
     CICCustomer,
@@ -67,9 +67,9 @@ from cic_models import (
     CICInquiryType,
     CICPaymentHistory,
     CICPaymentStatus,
-    CICPublicRecord,
+    national_id_key,
 )
-from models import db
+from models import CIC_RISK_CATEGORIES, CIC_RISK_THRESHOLDS, db
 
 
 class CICService:
@@ -90,6 +90,48 @@ class CICService:
     MAX_SCORE = 900
     SCORE_RANGE = MAX_SCORE - BASE_SCORE  # 600 points to distribute
 
+    # Account types for the installment/revolving credit mix bonus
+    INSTALLMENT_ACCOUNT_TYPES = frozenset(
+        {
+            CICAccountType.PERSONAL_LOAN,
+            CICAccountType.HOME_LOAN,
+            CICAccountType.AUTO_LOAN,
+            CICAccountType.STUDENT_LOAN,
+        }
+    )
+    REVOLVING_ACCOUNT_TYPES = frozenset(
+        {CICAccountType.CREDIT_CARD, CICAccountType.OVERDRAFT}
+    )
+
+    # Score bands: a value falls into the band given by bisecting its
+    # thresholds, and the score table has one more entry than thresholds.
+    # Utilization / DTI bands are upper-inclusive (bisect_left), the others
+    # lower-inclusive (bisect_right).
+
+    # Utilization ratio: <=10% excellent, <=30% very good, <=50% good,
+    # <=75% fair, <=90% poor, above that maxed out
+    UTILIZATION_THRESHOLDS = (0.10, 0.30, 0.50, 0.75, 0.90)
+    UTILIZATION_SCORES = (1.0, 0.90, 0.70, 0.50, 0.30, 0.10)
+
+    # Debt-to-income: <=20% excellent, <=36% good, <=50% fair, above poor
+    DTI_THRESHOLDS = (0.20, 0.36, 0.50)
+    DTI_SCORES = (1.0, 0.80, 0.60, 0.30)
+
+    # Credit history length in years: <1, 1-2, 2-3, 3-5, 5-7, 7-10, 10+
+    HISTORY_YEARS_THRESHOLDS = (1, 2, 3, 5, 7, 10)
+    HISTORY_YEARS_SCORES = (0.30, 0.50, 0.60, 0.70, 0.80, 0.90, 1.0)
+
+    # Number of active account types: 0, 1, 2, 3, 4+
+    CREDIT_MIX_SCORES = (0.0, 0.50, 0.70, 0.85, 1.0)
+
+    # Hard inquiries in 6 months: 0, 1, 2, 3-4, 5+ (credit-seeking)
+    INQUIRY_THRESHOLDS = (1, 2, 3, 5)
+    INQUIRY_SCORES = (1.0, 0.90, 0.75, 0.60, 0.30)
+
+    # Risk category by final score (shared with LoanApplication.cic_risk_category)
+    RISK_THRESHOLDS = CIC_RISK_THRESHOLDS
+    RISK_CATEGORIES = CIC_RISK_CATEGORIES
+
     @staticmethod
     def calculate_credit_score(national_id: str) -> Dict:
         """
@@ -114,7 +156,12 @@ class CICService:
             - recommendation: Lending recommendation
         """
 
-        customer = CICCustomer.query.filter_by(national_id=national_id).first()
+        # Collections are left to lazy-load: for one customer that is the same
+        # one SELECT each as an eager load, and the blacklist fast path in
+        # score_customer returns before touching any of them
+        customer = CICCustomer.query.filter(
+            CICCustomer.national_id_is(national_id)
+        ).first()
 
         if not customer:
             return {
@@ -123,6 +170,52 @@ class CICService:
                 "risk_category": "UNKNOWN",
             }
 
+        return CICService.score_customer(customer)
+
+    @staticmethod
+    def _scoring_load_options():
+        """
+        Loader options for the collections scoring walks.
+
+        Accounts, assets and public records are each fetched with one
+        SELECT ... IN for every customer the query returns, rather than a
+        lazy load per customer (batch scoring, credit report). Payment
+        history is not loaded: it is aggregated in SQL (see
+        payment_status_counts).
+        """
+        return (
+            selectinload(CICCustomer.credit_accounts),
+            selectinload(CICCustomer.assets),
+            selectinload(CICCustomer.public_records),
+        )
+
+    @staticmethod
+    def score_customer(
+        customer: CICCustomer,
+        payment_status_counts: Optional[Dict[str, int]] = None,
+        now: Optional[datetime] = None,
+        inquiry_counts: Optional[Tuple[int, int]] = None,
+    ) -> Dict:
+        """
+        Score an already-loaded customer (see calculate_credit_score).
+
+        Args:
+            customer: CIC customer; when scoring many, load them with
+                _scoring_load_options()
+            payment_status_counts: Pre-aggregated payment history counts by
+                status (see payment_status_counts); queried if omitted
+            now: Reference time (UTC) for history length and inquiry
+                windows; defaults to the current time
+            inquiry_counts: Pre-aggregated (6-month, 12-month) hard inquiry
+                counts (see recent_hard_inquiry_counts); queried if omitted
+
+        Returns:
+            Same dictionary as calculate_credit_score
+        """
+
+        if now is None:
+            now = datetime.utcnow()
+
         # If customer is blacklisted, return minimum score immediately
         if customer.is_blacklisted:
             return {
@@ -135,11 +228,20 @@ class CICService:
             }
 
         # Calculate each component score
-        payment_score = CICService._calculate_payment_history_score(customer)
+        payment_score = CICService._calculate_payment_history_score(
+            customer, payment_status_counts
+        )
         utilization_score = CICService._calculate_utilization_score(customer)
-        history_length_score = CICService._calculate_history_length_score(customer)
+        history_length_score = CICService._calculate_history_length_score(customer, now)
         credit_mix_score = CICService._calculate_credit_mix_score(customer)
-        recent_activity_score = CICService._calculate_recent_activity_score(customer)
+        if inquiry_counts is None:
+            inquiry_counts = CICService.recent_hard_inquiry_counts(
+                [customer.id], now
+            ).get(customer.id, (0, 0))
+        inquiries_6m, inquiries_12m = inquiry_counts
+        recent_activity_score = CICService._calculate_recent_activity_score(
+            inquiries_6m, inquiries_12m
+        )
 
         # Weighted combination
         final_score = (
@@ -192,6 +294,8 @@ class CICService:
                 "credit_mix": credit_mix_score,
                 "recent_activity": recent_activity_score,
             },
+            inquiries_6m,
+            now,
         )
 
         # Get lending recommendation
@@ -213,7 +317,9 @@ class CICService:
         }
 
     @staticmethod
-    def _calculate_payment_history_score(customer: CICCustomer) -> float:
+    def _calculate_payment_history_score(
+        customer: CICCustomer, status_counts: Optional[Dict[str, int]] = None
+    ) -> float:
         """
         Calculate payment history component (35% of total score).
 
@@ -231,30 +337,21 @@ class CICService:
         if not accounts:
             return 0.5  # No history = neutral score
 
-        total_payments = 0
-        on_time_payments = 0
-        late_30_count = 0
-        late_60_count = 0
-        late_90_count = 0
-        missed_count = 0
-
-        for account in accounts:
-            total_payments += account.total_payments_made
-            on_time_payments += account.on_time_payments
-
-            # Count late payments by severity from payment history
-            for payment in account.payment_history:
-                if payment.payment_status == CICPaymentStatus.LATE_1_30:
-                    late_30_count += 1
-                elif payment.payment_status == CICPaymentStatus.LATE_31_60:
-                    late_60_count += 1
-                elif payment.payment_status == CICPaymentStatus.LATE_61_90:
-                    late_90_count += 1
-                elif payment.payment_status in [
-                    CICPaymentStatus.LATE_90_PLUS,
-                    CICPaymentStatus.MISSED,
-                ]:
-                    missed_count += 1
+        total_payments = sum(account.total_payments_made for account in accounts)
+        on_time_payments = sum(account.on_time_payments for account in accounts)
+
+        # Count late payments by severity: one GROUP BY over the customer's
+        # payment history instead of loading every monthly row
+        if status_counts is None:
+            status_counts = CICService.payment_status_counts([customer.id]).get(
+                customer.id, {}
+            )
+        late_30_count = status_counts.get(CICPaymentStatus.LATE_1_30, 0)
+        late_60_count = status_counts.get(CICPaymentStatus.LATE_31_60, 0)
+        late_90_count = status_counts.get(CICPaymentStatus.LATE_61_90, 0)
+        missed_count = status_counts.get(
+            CICPaymentStatus.LATE_90_PLUS, 0
+        ) + status_counts.get(CICPaymentStatus.MISSED, 0)
 
         if total_payments == 0:
             return 0.5
@@ -300,43 +397,21 @@ class CICService:
             # Use debt-to-income ratio
             if customer.monthly_income and customer.monthly_income > 0:
                 monthly_debt = CICService._estimate_monthly_debt_payment(customer)
-                dti_ratio = float(monthly_debt) / float(customer.monthly_income)
-
-                # DTI scoring: <20% excellent, 20-36% good, 36-50% fair, >50% poor
-                if dti_ratio <= 0.20:
-                    return 1.0
-                elif dti_ratio <= 0.36:
-                    return 0.80
-                elif dti_ratio <= 0.50:
-                    return 0.60
-                else:
-                    return 0.30
+                dti_ratio = monthly_debt / customer.monthly_income
+
+                return CICService.DTI_SCORES[
+                    bisect_left(CICService.DTI_THRESHOLDS, dti_ratio)
+                ]
             else:
                 return 0.5  # No income data
 
-        # Calculate utilization ratio
-        utilization_ratio = float(customer.total_outstanding_debt) / float(
-            customer.total_credit_limit
-        )
-
-        # Score based on utilization
-        if utilization_ratio <= 0.10:
-            score = 1.0  # Excellent: using <10%
-        elif utilization_ratio <= 0.30:
-            score = 0.90  # Very good: 10-30%
-        elif utilization_ratio <= 0.50:
-            score = 0.70  # Good: 30-50%
-        elif utilization_ratio <= 0.75:
-            score = 0.50  # Fair: 50-75%
-        elif utilization_ratio <= 0.90:
-            score = 0.30  # Poor: 75-90%
-        else:
-            score = 0.10  # Very poor: >90% (maxed out)
-
-        return score
+        # Debt / limit is precomputed by the database (generated column)
+        return CICService.UTILIZATION_SCORES[
+            bisect_left(CICService.UTILIZATION_THRESHOLDS, customer.utilization_ratio)
+        ]
 
     @staticmethod
-    def _calculate_history_length_score(customer: CICCustomer) -> float:
+    def _calculate_history_length_score(customer: CICCustomer, now: datetime) -> float:
         """
         Calculate credit history length component (15% of total score).
 
@@ -355,25 +430,11 @@ class CICService:
             return 0.0  # No credit history
 
         # Calculate credit history length in years
-        history_years = (datetime.utcnow() - customer.first_credit_date).days / 365.25
-
-        # Score based on history length
-        if history_years >= 10:
-            score = 1.0
-        elif history_years >= 7:
-            score = 0.90
-        elif history_years >= 5:
-            score = 0.80
-        elif history_years >= 3:
-            score = 0.70
-        elif history_years >= 2:
-            score = 0.60
-        elif history_years >= 1:
-            score = 0.50
-        else:
-            score = 0.30  # Less than 1 year
+        history_years = (now - customer.first_credit_date).days / 365.25
 
-        return score
+        return CICService.HISTORY_YEARS_SCORES[
+            bisect_right(CICService.HISTORY_YEARS_THRESHOLDS, history_years)
+        ]
 
     @staticmethod
     def _calculate_credit_mix_score(customer: CICCustomer) -> float:
@@ -395,38 +456,23 @@ class CICService:
         if not accounts:
             return 0.0
 
-        # Count unique account types
-        account_types = set(
+        # Unique types among active accounts (one pass over the accounts)
+        account_types = {
             acc.account_type
             for acc in accounts
             if acc.account_status == CICAccountStatus.ACTIVE
-        )
+        }
         num_types = len(account_types)
 
         # Score based on diversity
-        if num_types >= 4:
-            score = 1.0  # Excellent mix
-        elif num_types == 3:
-            score = 0.85
-        elif num_types == 2:
-            score = 0.70
-        elif num_types == 1:
-            score = 0.50
-        else:
-            score = 0.0
+        mix_scores = CICService.CREDIT_MIX_SCORES
+        score = mix_scores[min(num_types, len(mix_scores) - 1)]
 
         # Bonus for having both installment and revolving credit
-        has_installment = any(
-            acc.account_type
-            in ["PERSONAL_LOAN", "HOME_LOAN", "AUTO_LOAN", "STUDENT_LOAN"]
-            for acc in accounts
-            if acc.account_status == CICAccountStatus.ACTIVE
-        )
-        has_revolving = any(
-            acc.account_type in ["CREDIT_CARD", "OVERDRAFT"]
-            for acc in accounts
-            if acc.account_status == CICAccountStatus.ACTIVE
+        has_installment = not account_types.isdisjoint(
+            CICService.INSTALLMENT_ACCOUNT_TYPES
         )
+        has_revolving = not account_types.isdisjoint(CICService.REVOLVING_ACCOUNT_TYPES)
 
         if has_installment and has_revolving:
             score += 0.10  # +10% bonus
@@ -434,7 +480,9 @@ class CICService:
         return min(1.0, score)
 
     @staticmethod
-    def _calculate_recent_activity_score(customer: CICCustomer) -> float:
+    def _calculate_recent_activity_score(
+        recent_inquiries_6m: int, recent_inquiries_12m: int
+    ) -> float:
         """
         Calculate recent credit activity component (10% of total score).
 
@@ -443,39 +491,20 @@ class CICService:
         Analyzes:
         - Hard inquiries in last 6 months
         - Hard inquiries in last 12 months
-        - New accounts opened recently
+
+        Args:
+            recent_inquiries_6m: Hard inquiries in the last 6 months
+            recent_inquiries_12m: Hard inquiries in the last 12 months
+                (see recent_hard_inquiry_counts)
 
         Returns:
             Score from 0.0 to 1.0
         """
 
-        six_months_ago = datetime.utcnow() - timedelta(days=180)
-        twelve_months_ago = datetime.utcnow() - timedelta(days=365)
-
-        # Count hard inquiries
-        recent_inquiries_6m = CICInquiry.query.filter(
-            CICInquiry.customer_id == customer.id,
-            CICInquiry.inquiry_type == CICInquiryType.HARD_INQUIRY,
-            CICInquiry.inquiry_date >= six_months_ago,
-        ).count()
-
-        recent_inquiries_12m = CICInquiry.query.filter(
-            CICInquiry.customer_id == customer.id,
-            CICInquiry.inquiry_type == CICInquiryType.HARD_INQUIRY,
-            CICInquiry.inquiry_date >= twelve_months_ago,
-        ).count()
-
         # Score based on inquiry count (6 months weighted more)
-        if recent_inquiries_6m == 0:
-            score = 1.0  # No recent inquiries - excellent
-        elif recent_inquiries_6m == 1:
-            score = 0.90  # One inquiry - very good
-        elif recent_inquiries_6m == 2:
-            score = 0.75  # Two inquiries - good
-        elif recent_inquiries_6m <= 4:
-            score = 0.60  # 3-4 inquiries - fair
-        else:
-            score = 0.30  # 5+ inquiries - concerning credit-seeking behavior
+        score = CICService.INQUIRY_SCORES[
+            bisect_right(CICService.INQUIRY_THRESHOLDS, recent_inquiries_6m)
+        ]
 
         # Additional penalty for many inquiries in 12 months
         if recent_inquiries_12m > 6:
@@ -491,11 +520,9 @@ class CICService:
         These are severe negative factors.
         """
 
-        public_records = CICPublicRecord.query.filter_by(
-            customer_id=customer.id, status="ACTIVE"
-        ).all()
-
-        for record in public_records:
+        for record in customer.public_records:
+            if record.status != "ACTIVE":
+                continue
             if "BANKRUPTCY" in record.record_type:
                 score -= 150  # Major penalty
             elif "JUDGMENT" in record.record_type:
@@ -520,17 +547,16 @@ class CICService:
         Assets provide security and recovery potential.
         """
 
-        total_unencumbered_assets = 0
-
-        assets = CICAsset.query.filter_by(customer_id=customer.id).all()
-        for asset in assets:
-            if not asset.is_encumbered:
-                total_unencumbered_assets += float(asset.estimated_value)
+        total_unencumbered_assets = sum(
+            asset.estimated_value
+            for asset in customer.assets
+            if not asset.is_encumbered
+        )
 
         # Bonus based on asset value relative to debt
         if customer.total_outstanding_debt > 0:
-            asset_to_debt_ratio = total_unencumbered_assets / float(
-                customer.total_outstanding_debt
+            asset_to_debt_ratio = (
+                total_unencumbered_assets / customer.total_outstanding_debt
             )
 
             if asset_to_debt_ratio >= 2.0:
@@ -545,19 +571,21 @@ class CICService:
     @staticmethod
     def _determine_risk_category(score: int) -> str:
         """Map credit score to risk category."""
-        if score >= 740:
-            return "LOW"
-        elif score >= 670:
-            return "MEDIUM"
-        elif score >= 580:
-            return "HIGH"
-        else:
-            return "SEVERE"
+        return CICService.RISK_CATEGORIES[
+            bisect_right(CICService.RISK_THRESHOLDS, score)
+        ]
 
     @staticmethod
-    def _get_score_factors(customer: CICCustomer, component_scores: Dict) -> List[str]:
+    def _get_score_factors(
+        customer: CICCustomer,
+        component_scores: Dict,
+        recent_inquiries: int,
+        now: datetime,
+    ) -> List[str]:
         """
         Generate human-readable factors affecting the score.
+
+        recent_inquiries is the hard-inquiry count for the last 6 months.
         """
 
         factors = []
@@ -574,9 +602,7 @@ class CICService:
 
         # Utilization factors
         if customer.total_credit_limit > 0:
-            util_ratio = float(
-                customer.total_outstanding_debt / customer.total_credit_limit
-            )
+            util_ratio = customer.utilization_ratio
             if util_ratio > 0.75:
                 factors.append(
                     f"High credit utilization ({util_ratio*100:.0f}%) - maxing out credit"
@@ -590,20 +616,13 @@ class CICService:
 
         # History length
         if customer.first_credit_date:
-            years = (datetime.utcnow() - customer.first_credit_date).days / 365.25
+            years = (now - customer.first_credit_date).days / 365.25
             if years >= 5:
                 factors.append(f"Established credit history ({years:.1f} years)")
             elif years < 2:
                 factors.append(f"Limited credit history ({years:.1f} years)")
 
         # Recent activity
-        six_months_ago = datetime.utcnow() - timedelta(days=180)
-        recent_inquiries = CICInquiry.query.filter(
-            CICInquiry.customer_id == customer.id,
-            CICInquiry.inquiry_type == CICInquiryType.HARD_INQUIRY,
-            CICInquiry.inquiry_date >= six_months_ago,
-        ).count()
-
         if recent_inquiries >= 4:
             factors.append(
                 f"Multiple recent credit applications ({recent_inquiries}) - credit-seeking behavior"
@@ -612,7 +631,7 @@ class CICService:
             factors.append("No recent credit inquiries - stable credit usage")
 
         # Asset factors
-        debt_threshold = float(customer.total_outstanding_debt or 0) * 1.5
+        debt_threshold = (customer.total_outstanding_debt or 0) * 1.5
         if customer.total_assets_value > debt_threshold:
             factors.append("Strong asset base - assets exceed debt significantly")
 
@@ -655,22 +674,24 @@ class CICService:
             return "REJECT - High risk profile, recommend denial"
 
     @staticmethod
-    def _estimate_monthly_debt_payment(customer: CICCustomer) -> Decimal:
-        """Estimate total monthly debt payments from all accounts."""
-        total = Decimal(0)
-        for account in customer.credit_accounts:
-            if (
-                account.account_status == CICAccountStatus.ACTIVE
-                and account.monthly_payment
-            ):
-                total += account.monthly_payment
-        return total
+    def _estimate_monthly_debt_payment(customer: CICCustomer) -> int:
+        """
+        Estimate total monthly debt payments (VND) from all active accounts.
+
+        Summed over the accounts scoring already loaded rather than with a
+        separate SUM query.
+        """
+        return sum(
+            account.monthly_payment or 0
+            for account in customer.credit_accounts
+            if account.account_status == CICAccountStatus.ACTIVE
+        )
 
     @staticmethod
     def perform_credit_check(
         national_id: str,
         applicant_name: str,
-        loan_amount: Decimal,
+        loan_amount: int,
         inquiring_institution: str = "RMIT NeoBank",
     ) -> Dict:
         """
@@ -692,8 +713,13 @@ class CICService:
             Dictionary with credit check results
         """
 
-        # Find customer
-        customer = CICCustomer.query.filter_by(national_id=national_id).first()
+        # One timestamp for the inquiry, score and bureau reference
+        now = datetime.utcnow()
+
+        # Find customer (collections lazy-load, see calculate_credit_score)
+        customer = CICCustomer.query.filter(
+            CICCustomer.national_id_is(national_id)
+        ).first()
 
         if not customer:
             return {
@@ -712,23 +738,24 @@ class CICService:
             inquiring_institution=inquiring_institution,
             inquiry_purpose=f"Loan Application - Amount: {loan_amount:,.0f} VND",
             loan_amount_requested=loan_amount,
-            inquiry_date=datetime.utcnow(),
+            inquiry_date=now,
         )
         db.session.add(inquiry)
 
-        # Calculate credit score
-        score_result = CICService.calculate_credit_score(national_id)
+        # Calculate credit score (the inquiry above is flushed by the
+        # scoring queries, so it already counts)
+        score_result = CICService.score_customer(customer, now=now)
 
         # Update customer's current score
         customer.current_credit_score = score_result["score"]
-        customer.score_last_updated = datetime.utcnow()
+        customer.score_last_updated = now
         customer.risk_category = score_result["risk_category"]
 
         # Save score history
         score_history = CICCreditScoreHistory(
             customer_id=customer.id,
             score=score_result["score"],
-            score_date=datetime.utcnow().date(),
+            score_date=now.date(),
             risk_category=score_result["risk_category"],
             primary_factor=(
                 score_result["factors"][0] if score_result["factors"] else None
@@ -736,14 +763,15 @@ class CICService:
         )
         db.session.add(score_history)
 
-        # Commit changes
-        db.session.commit()
-
         # Generate bureau reference
-        bureau_reference = f"CIC-VN-{datetime.utcnow().strftime('%Y%m%d')}-{national_id}-{int(datetime.utcnow().timestamp())}"
+        bureau_reference = (
+            f"CIC-VN-{now.strftime('%Y%m%d')}-{national_id}-{int(now.timestamp())}"
+        )
 
-        # Build comprehensive response
-        return {
+        # Build comprehensive response before committing: the commit expires
+        # the customer, and reading it back would re-select the row and
+        # lazy-load its collections again
+        result = {
             "success": True,
             "bureau_reference": bureau_reference,
             "score": score_result["score"],
@@ -773,9 +801,156 @@ class CICService:
                 "has_court_judgment": customer.has_court_judgment,
                 "has_debt_restructuring": customer.has_debt_restructuring,
             },
-            "raw_response": json.dumps(score_result, indent=2),
         }
 
+        # Commit changes
+        db.session.commit()
+
+        return result
+
+    # Max national IDs / customer IDs per IN (...) list in bulk queries
+    BULK_LOOKUP_CHUNK_SIZE = 500
+
+    @staticmethod
+    def payment_status_counts(customer_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """
+        Count payment history records per customer and payment status.
+
+        One GROUP BY (customer_id, payment_status) per chunk of
+        BULK_LOOKUP_CHUNK_SIZE customers, so batch scoring aggregates the
+        whole payment history table in a few scans instead of one query
+        per customer.
+
+        Returns:
+            Dictionary mapping customer ID to {payment_status: count};
+            customers without payment history are absent
+        """
+        counts = {}
+        chunk_size = CICService.BULK_LOOKUP_CHUNK_SIZE
+
+        for start in range(0, len(customer_ids), chunk_size):
+            chunk = customer_ids[start : start + chunk_size]
+            rows = (
+                db.session.query(
+                    CICCreditAccount.customer_id,
+                    CICPaymentHistory.payment_status,
+                    func.count(),
+                )
+                .select_from(CICPaymentHistory)
+                .join(CICCreditAccount)
+                .filter(CICCreditAccount.customer_id.in_(chunk))
+                .group_by(
+                    CICCreditAccount.customer_id, CICPaymentHistory.payment_status
+                )
+            )
+            for customer_id, payment_status, count in rows:
+                counts.setdefault(customer_id, {})[payment_status] = count
+
+        return counts
+
+    @staticmethod
+    def recent_hard_inquiry_counts(
+        customer_ids: List[int], now: datetime
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Count hard inquiries per customer in the 6 and 12 months before now.
+
+        Both windows come from one aggregate (COUNT ... FILTER), grouped by
+        customer, per chunk of BULK_LOOKUP_CHUNK_SIZE customers.
+
+        Returns:
+            Dictionary mapping customer ID to (last 6 months, last 12
+            months); customers without recent hard inquiries are absent
+        """
+        six_months_ago = now - timedelta(days=180)
+        twelve_months_ago = now - timedelta(days=365)
+        counts = {}
+        chunk_size = CICService.BULK_LOOKUP_CHUNK_SIZE
+
+        for start in range(0, len(customer_ids), chunk_size):
+            chunk = customer_ids[start : start + chunk_size]
+            rows = (
+                db.session.query(
+                    CICInquiry.customer_id,
+                    func.count().filter(CICInquiry.inquiry_date >= six_months_ago),
+                    func.count(),
+                )
+                .filter(
+                    CICInquiry.customer_id.in_(chunk),
+                    CICInquiry.inquiry_type == CICInquiryType.HARD_INQUIRY,
+                    CICInquiry.inquiry_date >= twelve_months_ago,
+                )
+                .group_by(CICInquiry.customer_id)
+            )
+            for customer_id, last_6m, last_12m in rows:
+                counts[customer_id] = (last_6m, last_12m)
+
+        return counts
+
+    @staticmethod
+    def calculate_credit_scores(customers: List[CICCustomer]) -> Dict[int, Dict]:
+        """
+        Score many customers at once, e.g. for a nightly recalculation.
+
+        Payment history and recent inquiries are aggregated for all
+        customers up front (see payment_status_counts and
+        recent_hard_inquiry_counts) and the scored collections are loaded
+        with one SELECT ... IN per chunk, instead of re-fetching each
+        customer by national ID as calculate_credit_score does.
+
+        Returns:
+            Dictionary mapping customer ID to the score_customer result
+        """
+        customer_ids = [customer.id for customer in customers]
+        now = datetime.utcnow()  # whole batch is scored as of one instant
+        status_counts = CICService.payment_status_counts(customer_ids)
+        inquiry_counts = CICService.recent_hard_inquiry_counts(customer_ids, now)
+        chunk_size = CICService.BULK_LOOKUP_CHUNK_SIZE
+        results = {}
+
+        for start in range(0, len(customer_ids), chunk_size):
+            chunk = customer_ids[start : start + chunk_size]
+            for customer in CICCustomer.query.options(
+                *CICService._scoring_load_options()
+            ).filter(CICCustomer.id.in_(chunk)):
+                results[customer.id] = CICService.score_customer(
+                    customer,
+                    payment_status_counts=status_counts.get(customer.id, {}),
+                    now=now,
+                    inquiry_counts=inquiry_counts.get(customer.id, (0, 0)),
+                )
+
+        return results
+
+    @staticmethod
+    def bulk_lookup(national_ids: List[str]) -> Dict[str, CICCustomer]:
+        """
+        Fetch CIC customers for many national IDs at once.
+
+        Issues one SELECT ... WHERE national_id IN (...) per chunk of
+        BULK_LOOKUP_CHUNK_SIZE IDs instead of one query per applicant.
+        IDs with no CIC record are simply absent from the result.
+
+        Args:
+            national_ids: National IDs to look up (duplicates allowed)
+
+        Returns:
+            Dictionary mapping national_id to CICCustomer
+        """
+        unique_ids = list(dict.fromkeys(national_ids))
+        customers = {}
+        chunk_size = CICService.BULK_LOOKUP_CHUNK_SIZE
+
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start : start + chunk_size]
+            keys = [national_id_key(national_id) for national_id in chunk]
+            for customer in CICCustomer.query.filter(
+                CICCustomer.national_id_hash.in_(keys)
+            ):
+                customers[customer.national_id] = customer
+
+        return customers
+
     @staticmethod
     def get_credit_report(national_id: str) -> Optional[Dict]:
         """
@@ -784,20 +959,22 @@ class CICService:
         Used by loan officers to review detailed credit history.
         """
 
-        customer = CICCustomer.query.filter_by(national_id=national_id).first()
+        customer = (
+            CICCustomer.query.options(*CICService._scoring_load_options())
+            .filter(CICCustomer.national_id_is(national_id))
+            .first()
+        )
         if not customer:
             return None
 
-        # Get all related data
-        accounts = CICCreditAccount.query.filter_by(customer_id=customer.id).all()
-        assets = CICAsset.query.filter_by(customer_id=customer.id).all()
+        # Inquiries and score history are capped, so they keep their own
+        # ordered, limited queries
         inquiries = (
             CICInquiry.query.filter_by(customer_id=customer.id)
             .order_by(CICInquiry.inquiry_date.desc())
             .limit(10)
             .all()
         )
-        public_records = CICPublicRecord.query.filter_by(customer_id=customer.id).all()
         score_history = (
             CICCreditScoreHistory.query.filter_by(customer_id=customer.id)
             .order_by(CICCreditScoreHistory.score_date.desc())
@@ -807,10 +984,10 @@ class CICService:
 
         return {
             "customer": customer,
-            "accounts": accounts,
-            "assets": assets,
+            "accounts": customer.credit_accounts,
+            "assets": customer.assets,
             "inquiries": inquiries,
-            "public_records": public_records,
+            "public_records": customer.public_records,
             "score_history": score_history,
             "current_score": customer.current_credit_score,
             "risk_category": customer.risk_category,
@@ -33,10 +33,145 @@ Security Considerations for External Integrations:
 """
 
 import random
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
-def perform_credit_check(applicant_name: str, national_id: str, dob) -> dict:
+class CircuitBreakerError(Exception):
+    """Raised instead of calling the bureau while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for calls to the credit bureau.
+
+    While CLOSED, calls pass through and consecutive failures are counted.
+    After ``fail_max`` failures in a row the breaker OPENS and every call fails
+    immediately with CircuitBreakerError instead of waiting on a dead bureau.
+    Once ``reset_timeout`` seconds have passed, a single HALF_OPEN probe call
+    is let through: success closes the breaker, failure re-opens it.
+
+    Exceptions listed in ``exclude`` (e.g. bad input) are re-raised without
+    counting as bureau failures.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, fail_max=5, reset_timeout=30, exclude=()):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.exclude = tuple(exclude)
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.last_failure_time = None
+        self._lock = threading.RLock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.last_failure_time < self.reset_timeout:
+                    raise CircuitBreakerError("Credit bureau circuit is open")
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                # A probe is already in flight; keep failing fast until it returns
+                raise CircuitBreakerError("Credit bureau circuit is half-open")
+
+    def _on_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+
+    def _on_failure(self):
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            if self.state == self.HALF_OPEN or self.failure_count >= self.fail_max:
+                self.state = self.OPEN
+
+    def call(self, func, *args, **kwargs):
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.exclude:
+            self._on_success()
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+
+# Shared by every request thread so an outage seen by one trips it for all
+bureau_breaker = CircuitBreaker(fail_max=5, reset_timeout=30, exclude=[ValueError])
+
+# Bulkhead: at most BRANCH_CONCURRENCY bureau calls in flight per branch, so a
+# burst from one branch cannot use up the bureau's per-client rate limit for
+# all of them. A caller that cannot get a slot within BRANCH_ACQUIRE_TIMEOUT
+# seconds gets a PENDING result instead of queueing behind the burst.
+BRANCH_CONCURRENCY = 5
+BRANCH_ACQUIRE_TIMEOUT = 2.0
+_branch_limits = {}
+_branch_limits_lock = threading.Lock()
+
+
+def _branch_limit(branch_code):
+    """Return the semaphore bounding concurrent bureau calls for a branch."""
+    with _branch_limits_lock:
+        semaphore = _branch_limits.get(branch_code)
+        if semaphore is None:
+            semaphore = _branch_limits[branch_code] = threading.BoundedSemaphore(
+                BRANCH_CONCURRENCY
+            )
+        return semaphore
+
+
+RISK_BAND_RECOMMENDATIONS = {
+    "LOW": "Strong creditworthiness. Approve up to standard limits.",
+    "MEDIUM": "Moderate risk. Manual review recommended. Consider reduced limit or collateral.",
+    "HIGH": "High credit risk. Reject or require substantial collateral and guarantor.",
+}
+
+# Mock bureau report layout, filled in by render_report with str.format_map
+BUREAU_REPORT_TEMPLATE = """
+    === CREDIT BUREAU REPORT ===
+    Bureau: Credit Information Center (CIC) - Vietnam
+    Report Date: {report_date} UTC
+    
+    APPLICANT INFORMATION:
+    Name: {applicant_name}
+    National ID: {national_id}
+    Date of Birth: {dob}
+    
+    CREDIT SCORE: {score} / 900
+    Risk Band: {risk_band}
+    
+    SCORE FACTORS:
+    - Payment History: {on_time_pct}% on-time
+    - Credit Utilization: {utilization_pct}%
+    - Credit Age: {credit_age_years} years
+    - Recent Inquiries: {recent_inquiries} in last 6 months
+    - Total Accounts: {total_accounts}
+    
+    RECOMMENDATION: {recommendation}
+    
+    DISCLAIMER: This is a simulated report for educational purposes.
+    Real credit bureau reports contain detailed trade lines, payment history,
+    public records, and inquiries.
+    
+    Bureau Reference: {bureau_reference}
+    ===========================
+    """.strip()
+
+
+def perform_credit_check(
+    applicant_name: str, national_id: str, dob, branch_code: str = None
+) -> dict:
     """
     Mock implementation of a credit bureau API call.
 
@@ -88,13 +223,22 @@ def perform_credit_check(applicant_name: str, national_id: str, dob) -> dict:
         applicant_name: Full name of loan applicant
         national_id: National ID / SSN (PII - handle securely)
         dob: Date of birth (for identity verification)
+        branch_code: Requesting branch, for the per-branch concurrency cap
 
     Returns:
         Dictionary containing:
         - bureau_reference: Unique reference ID from bureau
         - score: Credit score (300-900 range, FICO-like)
         - risk_band: HIGH / MEDIUM / LOW (simplified risk categorization)
-        - raw_response: Full bureau response (for audit trail)
+        - report_date: Report timestamp (UTC)
+        - applicant: Name, national ID and DOB as sent to the bureau
+        - factors: Score factors as integers (see render_report for the text)
+
+        While the bureau circuit breaker is open the call is not attempted and
+        {"status": "FAILED", "score": None, "risk_band": None,
+        "bureau_reference": None} is returned immediately. If the branch
+        already has BRANCH_CONCURRENCY calls in flight and no slot frees up in
+        time, the same shape is returned with "status": "PENDING".
 
     Example Real Bureau Response (simplified):
     {
@@ -127,70 +271,169 @@ def perform_credit_check(applicant_name: str, national_id: str, dob) -> dict:
         ]
     }
     """
+    return _guarded_credit_check(
+        applicant_name, national_id, dob, branch_code, BRANCH_ACQUIRE_TIMEOUT
+    )
 
-    # MOCK IMPLEMENTATION: Generate random score
+
+def _guarded_credit_check(applicant_name, national_id, dob, branch_code, timeout):
+    """
+    Call the bureau inside the branch bulkhead and the circuit breaker.
+
+    ``timeout`` is how long to wait for a branch slot; None waits until one
+    frees up, so the PENDING result is only returned for a finite timeout.
+    """
+    branch_limit = _branch_limit(branch_code)
+    if not branch_limit.acquire(timeout=timeout):
+        return {
+            "status": "PENDING",
+            "score": None,
+            "risk_band": None,
+            "bureau_reference": None,
+        }
+    try:
+        return bureau_breaker.call(_query_bureau, applicant_name, national_id, dob)
+    except CircuitBreakerError:
+        return {
+            "status": "FAILED",
+            "score": None,
+            "risk_band": None,
+            "bureau_reference": None,
+        }
+    finally:
+        branch_limit.release()
+
+
+def perform_credit_check_batch(applicants: list, max_workers: int = 10) -> list:
+    """
+    Run credit checks for a batch of applicants concurrently.
+
+    Bureau calls are network-bound, so a thread pool overlaps the round trips
+    instead of paying them one after another. Once the circuit breaker opens,
+    the remaining checks return the FAILED result without calling the bureau.
+
+    Each check still goes through its branch's bulkhead, so at most
+    BRANCH_CONCURRENCY calls per branch run at once whatever max_workers is.
+    Unlike a single check, a batch item waits for a branch slot instead of
+    coming back PENDING. When every applicant shares one branch the pool is
+    capped at BRANCH_CONCURRENCY so no worker sits idle waiting for a slot.
+
+    Args:
+        applicants: Dicts with applicant_name, national_id and dob keys (and
+            optionally branch_code)
+        max_workers: Maximum concurrent bureau calls (per-caller bulkhead)
+
+    Returns:
+        One perform_credit_check result per applicant, FAILED or completed,
+        in input order
+    """
+    branches = {applicant.get("branch_code") for applicant in applicants}
+    if len(branches) == 1:
+        max_workers = min(max_workers, BRANCH_CONCURRENCY)
+
+    def check(applicant):
+        return _guarded_credit_check(
+            applicant["applicant_name"],
+            applicant["national_id"],
+            applicant["dob"],
+            applicant.get("branch_code"),
+            None,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(check, applicants))
+
+
+def _query_bureau(applicant_name: str, national_id: str, dob) -> dict:
+    """Query the bureau for one applicant (guarded by ``bureau_breaker``)."""
+    # MOCK IMPLEMENTATION: Generate random score and factors
     # Real implementation would make HTTPS API call here
-    score = random.randint(300, 900)
+    # One uniform draw over every combination of field values, split with
+    # divmod into an independent, exactly uniform value per field
+    draw = random.randrange(601 * 31 * 71 * 15 * 11 * 8)
+    draw, score = divmod(draw, 601)
+    draw, on_time_pct = divmod(draw, 31)
+    draw, utilization_pct = divmod(draw, 71)
+    draw, credit_age_years = divmod(draw, 15)
+    total_accounts, recent_inquiries = divmod(draw, 11)
+    score += 300
 
     # Derive risk band from score (simplified decisioning logic)
     # Real banks use more complex models with multiple factors
     if score >= 750:
         risk_band = "LOW"
-        recommendation = "Strong creditworthiness. Approve up to standard limits."
     elif score >= 600:
         risk_band = "MEDIUM"
-        recommendation = "Moderate risk. Manual review recommended. Consider reduced limit or collateral."
     else:
         risk_band = "HIGH"
-        recommendation = (
-            "High credit risk. Reject or require substantial collateral and guarantor."
-        )
 
     # Generate mock bureau reference (format similar to real systems)
-    bureau_reference = f"CIC-VN-{datetime.utcnow().strftime('%Y%m%d')}-{national_id}-{int(datetime.utcnow().timestamp())}"
-
-    # Mock response payload (simulates what bureau would return)
-    raw_response = f"""
-    === CREDIT BUREAU REPORT ===
-    Bureau: Credit Information Center (CIC) - Vietnam
-    Report Date: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
-    
-    APPLICANT INFORMATION:
-    Name: {applicant_name}
-    National ID: {national_id}
-    Date of Birth: {dob}
-    
-    CREDIT SCORE: {score} / 900
-    Risk Band: {risk_band}
-    
-    SCORE FACTORS:
-    - Payment History: {random.randint(70, 100)}% on-time
-    - Credit Utilization: {random.randint(10, 80)}%
-    - Credit Age: {random.randint(1, 15)} years
-    - Recent Inquiries: {random.randint(0, 10)} in last 6 months
-    - Total Accounts: {random.randint(1, 8)}
-    
-    RECOMMENDATION: {recommendation}
-    
-    DISCLAIMER: This is a simulated report for educational purposes.
-    Real credit bureau reports contain detailed trade lines, payment history,
-    public records, and inquiries.
-    
-    Bureau Reference: {bureau_reference}
-    ===========================
-    """
+    now = datetime.utcnow()
+    bureau_reference = (
+        f"CIC-VN-{now.strftime('%Y%m%d')}-{national_id}-{int(now.timestamp())}"
+    )
 
     # In production, also log this query for audit trail
     # logger.info(f"Credit check performed for {national_id}, score: {score}, ref: {bureau_reference}")
 
+    # Structured response; render_report() builds the readable report on demand
     return {
         "bureau_reference": bureau_reference,
         "score": score,
         "risk_band": risk_band,
-        "raw_response": raw_response.strip(),
+        "report_date": now.strftime("%Y-%m-%d %H:%M:%S"),
+        # Identity as submitted to the bureau, kept with the report for audit
+        "applicant": {
+            "name": applicant_name,
+            "national_id": national_id,
+            "dob": str(dob),
+        },
+        "factors": {
+            "on_time_pct": 70 + on_time_pct,
+            "utilization_pct": 10 + utilization_pct,
+            "credit_age_years": 1 + credit_age_years,
+            "recent_inquiries": recent_inquiries,
+            "total_accounts": 1 + total_accounts,
+        },
     }
 
 
+def render_report(response: dict) -> str:
+    """
+    Render a structured bureau response as the human-readable report text.
+
+    Only called when a report is displayed or exported, so checks that are
+    merely scored and stored never build the text. The applicant details are
+    the ones sent to the bureau at the time of the check, not the current
+    application data.
+
+    Args:
+        response: Bureau response as returned by perform_credit_check
+
+    Returns:
+        Formatted report text
+    """
+    applicant = response.get("applicant", {})
+    return BUREAU_REPORT_TEMPLATE.format_map(
+        {
+            **response["factors"],
+            "report_date": response["report_date"],
+            "applicant_name": applicant.get("name", "Not recorded"),
+            "national_id": applicant.get("national_id", "Not recorded"),
+            "dob": applicant.get("dob", "Not recorded"),
+            "score": response["score"],
+            "risk_band": response["risk_band"],
+            "recommendation": RISK_BAND_RECOMMENDATIONS[response["risk_band"]],
+            "bureau_reference": response["bureau_reference"],
+        }
+    )
+
+
+# Fields every bureau response must carry, and the risk bands it may report
+_REQUIRED_FIELDS = frozenset({"bureau_reference", "score", "risk_band", "factors"})
+_VALID_RISK_BANDS = frozenset({"LOW", "MEDIUM", "HIGH"})
+
+
 def validate_bureau_response(response: dict) -> bool:
     """
     Validate credit bureau response to detect tampering or malformed data.
@@ -208,26 +451,22 @@ def validate_bureau_response(response: dict) -> bool:
     Returns:
         True if response is valid, False otherwise
     """
-    # Basic validation checks
-    required_fields = ["bureau_reference", "score", "risk_band", "raw_response"]
-
     # Check all required fields present
-    if not all(field in response for field in required_fields):
+    if not _REQUIRED_FIELDS <= response.keys():
         return False
 
-    # Validate score range
-    score = response.get("score")
-    if not isinstance(score, int) or not (300 <= score <= 900):
+    # Validate score range (exact int check also rejects bools)
+    score = response["score"]
+    if type(score) is not int or not (300 <= score <= 900):
         return False
 
     # Validate risk band
-    risk_band = response.get("risk_band")
-    if risk_band not in ["LOW", "MEDIUM", "HIGH"]:
+    if response["risk_band"] not in _VALID_RISK_BANDS:
         return False
 
     # In production: also verify digital signature
     # signature_valid = verify_signature(
-    #     data=response["raw_response"],
+    #     data=response["factors"],
     #     signature=response.get("signature"),
     #     public_key=BUREAU_PUBLIC_KEY
     # )
@@ -237,7 +476,50 @@ def validate_bureau_response(response: dict) -> bool:
     return True
 
 
-def get_decisioning_recommendation(score: int, requested_amount: float) -> dict:
+# Decision tiers as (template, max amount in tenths of the requested amount),
+# indexed by how many of the score thresholds the score meets. Conditions are
+# tuples so callers cannot mutate the shared templates.
+_DECISION_SCORE_THRESHOLDS = (600, 700, 800)
+_DECISION_TIERS = (
+    (
+        {
+            "decision": "AUTO_REJECT",
+            "conditions": ("Credit score below minimum threshold",),
+            "interest_rate_tier": "N/A",
+        },
+        0,
+    ),
+    (
+        {
+            "decision": "MANUAL_REVIEW",
+            "conditions": (
+                "Require additional documentation",
+                "Employment verification",
+            ),
+            "interest_rate_tier": "SUBPRIME",
+        },
+        8,
+    ),
+    (
+        {
+            "decision": "AUTO_APPROVE",
+            "conditions": ("Standard terms",),
+            "interest_rate_tier": "STANDARD",
+        },
+        10,
+    ),
+    (
+        {
+            "decision": "AUTO_APPROVE",
+            "conditions": (),
+            "interest_rate_tier": "PRIME",
+        },
+        12,  # Can offer more
+    ),
+)
+
+
+def get_decisioning_recommendation(score: int, requested_amount: int) -> dict:
     """
     Apply automated credit decisioning rules based on score and loan amount.
 
@@ -253,40 +535,13 @@ def get_decisioning_recommendation(score: int, requested_amount: float) -> dict:
 
     Args:
         score: Credit bureau score
-        requested_amount: Loan amount requested by applicant
+        requested_amount: Loan amount requested by applicant (whole dong)
 
     Returns:
-        Dictionary with decision, max_approved_amount, and conditions
+        Dictionary with decision, max_approved_amount (whole dong), and conditions
     """
-    # Example decision matrix (simplified)
-    if score >= 800:
-        return {
-            "decision": "AUTO_APPROVE",
-            "max_approved_amount": requested_amount * 1.2,  # Can offer more
-            "conditions": [],
-            "interest_rate_tier": "PRIME",
-        }
-    elif score >= 700:
-        return {
-            "decision": "AUTO_APPROVE",
-            "max_approved_amount": requested_amount,
-            "conditions": ["Standard terms"],
-            "interest_rate_tier": "STANDARD",
-        }
-    elif score >= 600:
-        return {
-            "decision": "MANUAL_REVIEW",
-            "max_approved_amount": requested_amount * 0.8,
-            "conditions": [
-                "Require additional documentation",
-                "Employment verification",
-            ],
-            "interest_rate_tier": "SUBPRIME",
-        }
-    else:
-        return {
-            "decision": "AUTO_REJECT",
-            "max_approved_amount": 0,
-            "conditions": ["Credit score below minimum threshold"],
-            "interest_rate_tier": "N/A",
-        }
+    # Example decision matrix (simplified): pick the tier, then scale the amount
+    tier, amount_tenths = _DECISION_TIERS[
+        bisect_right(_DECISION_SCORE_THRESHOLDS, score)
+    ]
+    return {**tier, "max_approved_amount": requested_amount * amount_tenths // 10}
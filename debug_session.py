@@ -2,6 +2,8 @@
 Debug script to test session cookie validity
 """
 
+from functools import lru_cache
+
 from flask import Flask
 from itsdangerous import BadSignature, URLSafeTimedSerializer
 
@@ -9,9 +11,15 @@ app = Flask(__name__)
 app.config["SECRET_KEY"] = "change-this-in-production-use-strong-random-key"
 
 
+@lru_cache(maxsize=1)
+def _serializer(secret_key):
+    """Build the cookie serializer once per SECRET_KEY"""
+    return URLSafeTimedSerializer(secret_key)
+
+
 def test_session_cookie(cookie_value):
     """Test if a session cookie is valid"""
-    serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    serializer = _serializer(app.config["SECRET_KEY"])
 
     try:
         session_data = serializer.loads(cookie_value)
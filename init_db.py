@@ -1,33 +1,137 @@
 """
 Database Initialization Script
-Drops all tables and recreates them with the new schema.
+Creates any missing tables and checks existing ones against the models.
 Includes both CAS (Credit Application System) and CIC (Credit Information Center) models.
+
+Usage:
+    python init_db.py           # Create missing tables, verify the rest (keeps data)
+    python init_db.py --force   # Drop all tables and recreate them (destroys data)
 """
 
+import sys
+
 # Import CIC models to ensure they're registered with SQLAlchemy
 import cic_models
 from app import app, db
+from models import APPLICATION_SEARCH_TABLE
+
+
+def _normalise_type(type_name):
+    """Compare column types by their DDL spelling, ignoring case and spaces."""
+    return type_name.upper().replace(" ", "")
+
+
+def _normalise_sql(sql):
+    """Compare generated-column expressions ignoring whitespace and case."""
+    return "".join(sql.split()).upper()
+
+
+def column_differences(inspector, table):
+    """
+    Describe how an existing table's columns differ from its model.
+
+    Compares column names, DDL types and generated-column expressions, so a
+    database built from an older schema is caught before queries fail on it.
+    """
+    reflected = {col["name"]: col for col in inspector.get_columns(table.name)}
+    differences = []
+    for column in table.columns:
+        existing = reflected.pop(column.name, None)
+        if existing is None:
+            differences.append(f"{table.name}.{column.name}: missing")
+            continue
+        declared_type = column.type.compile(dialect=db.engine.dialect)
+        existing_type = str(existing["type"])
+        if _normalise_type(declared_type) != _normalise_type(existing_type):
+            differences.append(
+                f"{table.name}.{column.name}: {existing_type} in the database,"
+                f" {declared_type} in the model"
+            )
+        if (column.computed is not None) != ("computed" in existing):
+            differences.append(f"{table.name}.{column.name}: generated column mismatch")
+        elif column.computed is not None and _normalise_sql(
+            str(column.computed.sqltext)
+        ) != _normalise_sql(existing["computed"]["sqltext"]):
+            differences.append(
+                f"{table.name}.{column.name}: generated expression differs"
+            )
+    differences.extend(f"{table.name}.{name}: not in the model" for name in reflected)
+    return differences
+
+
+force = "--force" in sys.argv[1:]
 
 print("=" * 70)
 print("🗄️  DATABASE INITIALIZATION (CAS + CIC)")
 print("=" * 70)
 
+
 with app.app_context():
-    print("\n🗑️  Dropping all existing tables...")
-    db.drop_all()
-    print("  ✅ All tables dropped")
-
-    print("\n🔧 Creating tables with new schema...")
-    print("  📋 CAS tables (Users, LoanApplications, CreditChecks)")
-    print(
-        "  📋 CIC tables (Customers, Accounts, PaymentHistory, Assets, Inquiries, etc.)"
+    inspector = db.inspect(db.engine)
+    declared = set(db.metadata.tables)
+
+    # Tables in the database that no model declares. The FTS5 search table
+    # (and its shadow tables) are created by DDL hooks on loan_applications
+    # rather than declared as models, so they are not counted.
+    undeclared = sorted(
+        name
+        for name in set(inspector.get_table_names()) - declared - {"alembic_version"}
+        if not name.startswith(APPLICATION_SEARCH_TABLE)
     )
-    db.create_all()
-    print("  ✅ All tables created")
+
+    if force:
+        print("\n🗑️  Dropping all existing tables (--force)...")
+        db.drop_all()
+        if undeclared:
+            undeclared_metadata = db.MetaData()
+            undeclared_metadata.reflect(bind=db.engine, only=undeclared)
+            undeclared_metadata.drop_all(bind=db.engine)
+            undeclared = []
+        print("  ✅ All tables dropped")
+        inspector = db.inspect(db.engine)
+
+    existing = set(inspector.get_table_names())
+    missing = declared - existing
+
+    differences = [
+        difference
+        for name in sorted(declared & existing)
+        for difference in column_differences(inspector, db.metadata.tables[name])
+    ]
+    if differences:
+        print("\n❌ Existing tables do not match the models:")
+        for difference in differences:
+            print(f"  - {difference}")
+        print("\n  Run 'python init_db.py --force' to rebuild them (destroys data)")
+        sys.exit(1)
+
+    if undeclared:
+        print(
+            f"\n⚠️  {len(undeclared)} table(s) not declared by any model (left as-is):"
+        )
+        for name in undeclared:
+            print(f"  - {name}")
+        print("  Run 'python init_db.py --force' to drop them (destroys data)")
+
+    if not missing:
+        print("\n✅ Schema already up to date, nothing to create")
+    else:
+        print(f"\n🔧 Creating {len(missing)} missing table(s)...")
+        print("  📋 CAS tables (Users, LoanApplications, CreditChecks)")
+        print(
+            "  📋 CIC tables (Customers, Accounts, PaymentHistory, Assets, Inquiries, etc.)"
+        )
+        db.metadata.create_all(
+            bind=db.engine,
+            tables=[db.metadata.tables[name] for name in missing],
+        )
+        print("  ✅ Missing tables created")
 
 print("\n✅ Database initialization complete!")
 print("=" * 70)
 print("\n💡 Next steps:")
-print("  1️⃣  Run 'python seed_data_new.py' to populate CAS data (users + applications)")
+print(
+    "  1️⃣  Run 'python seed_data_new.py' to populate CAS data (users + applications)"
+)
 print("  2️⃣  Run 'python seed_cic_data.py' to populate CIC data (credit profiles)")
 print("=" * 70 + "\n")
@@ -10,13 +10,38 @@ Simulates a real-world loan origination system (CAS) with:
 Educational purpose: Demonstrates proper database design for secure banking applications.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event
 
 db = SQLAlchemy()
 
 
+# ============================================================================
+# Column Types
+# ============================================================================
+
+
+class VND(db.TypeDecorator):
+    """
+    Whole-dong money amount stored as a 64-bit integer.
+
+    The dong has no minor unit, so amounts are kept as BIGINT instead of
+    Numeric(18, 2): SUM/AVG run as native integer aggregates and values load
+    as plain int rather than decimal.Decimal. Bound values (Decimal, float or
+    int) are rounded to the nearest dong.
+    """
+
+    impl = db.BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(value))
+
+
 # ============================================================================
 # Role and Status Constants
 # ============================================================================
@@ -99,6 +124,26 @@ class CreditCheckStatus:
     FAILED = "FAILED"
 
 
+# CIC risk category by final score: <580, 580-669, 670-739, 740+. CICService
+# categorises scores with these bands and LoanApplication.cic_risk_category is
+# generated from them, so both follow any change made here.
+CIC_RISK_THRESHOLDS = (580, 670, 740)
+CIC_RISK_CATEGORIES = ("SEVERE", "HIGH", "MEDIUM", "LOW")
+
+
+def cic_risk_category_sql(score_column):
+    """SQL CASE mapping a score column to its CIC risk category (NULL stays NULL)."""
+    bands = zip(reversed(CIC_RISK_THRESHOLDS), reversed(CIC_RISK_CATEGORIES[1:]))
+    whens = "".join(
+        f" WHEN {score_column} >= {threshold} THEN '{category}'"
+        for threshold, category in bands
+    )
+    return (
+        f"CASE{whens} WHEN {score_column} IS NOT NULL"
+        f" THEN '{CIC_RISK_CATEGORIES[0]}' END"
+    )
+
+
 # ============================================================================
 # Database Models
 # ============================================================================
@@ -109,7 +154,7 @@ class User(db.Model):
     Banking staff user model.
 
     Security Design Considerations:
-    - Passwords are NEVER stored in plaintext (hashed with Werkzeug's pbkdf2:sha256)
+    - Passwords are NEVER stored in plaintext (hashed with Argon2id)
     - branch_code enables data isolation (branch officers only see their branch's data)
     - role field enables RBAC enforcement
     - is_active allows account deactivation without deletion (audit trail preservation)
@@ -179,13 +224,13 @@ class LoanApplication(db.Model):
     product_code = db.Column(
         db.String(32), nullable=False
     )  # e.g., PL_SAL, HL_STD, BL_SME
-    requested_amount = db.Column(db.Numeric(18, 2), nullable=False)
+    requested_amount = db.Column(VND, nullable=False)  # Whole dong
     tenure_months = db.Column(db.Integer, nullable=False)
 
     # Workflow and Access Control Fields
     branch_code = db.Column(
-        db.String(16), nullable=False, index=True
-    )  # CRITICAL for RBAC
+        db.String(16), nullable=False
+    )  # CRITICAL for RBAC; indexed as the leading column of ix_app_branch_status_created
     created_by_user_id = db.Column(
         db.Integer, db.ForeignKey("users.id"), nullable=False
     )
@@ -216,9 +261,14 @@ class LoanApplication(db.Model):
         db.String(32), nullable=True, default="NOT_CHECKED"
     )  # NOT_CHECKED, PENDING, COMPLETED, FAILED
     cic_credit_score = db.Column(db.Integer, nullable=True)  # 300-900 score from CIC
+    # LOW, MEDIUM, HIGH, SEVERE: derived from the score by the database using
+    # the same CIC_RISK_THRESHOLDS bands as CICService. Changing the bands
+    # changes this column's DDL, so existing databases need a rebuild.
     cic_risk_category = db.Column(
-        db.String(16), nullable=True
-    )  # LOW, MEDIUM, HIGH, SEVERE
+        db.String(16),
+        db.Computed(cic_risk_category_sql("cic_credit_score"), persisted=True),
+        index=True,
+    )
     cic_bureau_reference = db.Column(
         db.String(128), nullable=True
     )  # CIC reference number for audit
@@ -230,6 +280,9 @@ class LoanApplication(db.Model):
     cic_checked_by_user_id = db.Column(
         db.Integer, db.ForeignKey("users.id"), nullable=True
     )  # Who requested CIC check
+    cic_check_started_at = db.Column(
+        db.DateTime, nullable=True
+    )  # When the current/last CIC check was queued
 
     # Audit timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -251,6 +304,26 @@ class LoanApplication(db.Model):
         "User", foreign_keys=[cic_checked_by_user_id], lazy=True
     )
 
+    # Composite indexes for the hot listing/dashboard paths: every query is
+    # scoped by branch_code, then filtered by status or ordered by created_at.
+    __table_args__ = (
+        db.Index("ix_app_branch_status_created", "branch_code", "status", "created_at"),
+        db.Index("ix_app_assigned_expert_status", "assigned_expert_id", "status"),
+    )
+
+    # A CIC check still PENDING after this long is assumed lost (worker died or
+    # the process restarted) and may be requested again
+    CIC_CHECK_TIMEOUT = timedelta(minutes=5)
+
+    @property
+    def cic_check_in_progress(self):
+        """True while a queued CIC check is PENDING and not yet timed out."""
+        return (
+            self.cic_check_status == "PENDING"
+            and self.cic_check_started_at is not None
+            and datetime.utcnow() - self.cic_check_started_at < self.CIC_CHECK_TIMEOUT
+        )
+
     def __repr__(self):
         return f"<LoanApplication {self.application_ref} - {self.applicant_name}>"
 
@@ -308,5 +381,77 @@ class CreditCheck(db.Model):
     application = db.relationship("LoanApplication", backref="credit_checks", lazy=True)
     requested_by = db.relationship("User", lazy=True)
 
+    # Dashboard "completed today" count filters on completed_at
+    __table_args__ = (db.Index("ix_creditcheck_completed_at", "completed_at"),)
+
     def __repr__(self):
         return f"<CreditCheck app={self.application_id} bureau_ref={self.bureau_reference} score={self.score}>"
+
+
+# ============================================================================
+# Full-Text Search Index (SQLite FTS5)
+# ============================================================================
+# Application search matches substrings of ref / name / national ID. A
+# leading-wildcard LIKE cannot use a B-tree index, so an external-content FTS5
+# table with the trigram tokenizer indexes those columns instead; triggers keep
+# it in sync with loan_applications. Created alongside the table by create_all().
+
+APPLICATION_SEARCH_TABLE = "loan_applications_fts"
+
+_APPLICATION_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {APPLICATION_SEARCH_TABLE} USING fts5(
+        application_ref, applicant_name, national_id,
+        content='loan_applications', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS loan_applications_fts_ai
+    AFTER INSERT ON loan_applications BEGIN
+        INSERT INTO {APPLICATION_SEARCH_TABLE}
+            (rowid, application_ref, applicant_name, national_id)
+        VALUES (new.id, new.application_ref, new.applicant_name, new.national_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS loan_applications_fts_ad
+    AFTER DELETE ON loan_applications BEGIN
+        INSERT INTO {APPLICATION_SEARCH_TABLE}
+            ({APPLICATION_SEARCH_TABLE}, rowid, application_ref, applicant_name,
+             national_id)
+        VALUES ('delete', old.id, old.application_ref, old.applicant_name,
+                old.national_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS loan_applications_fts_au
+    AFTER UPDATE OF application_ref, applicant_name, national_id
+    ON loan_applications BEGIN
+        INSERT INTO {APPLICATION_SEARCH_TABLE}
+            ({APPLICATION_SEARCH_TABLE}, rowid, application_ref, applicant_name,
+             national_id)
+        VALUES ('delete', old.id, old.application_ref, old.applicant_name,
+                old.national_id);
+        INSERT INTO {APPLICATION_SEARCH_TABLE}
+            (rowid, application_ref, applicant_name, national_id)
+        VALUES (new.id, new.application_ref, new.applicant_name, new.national_id);
+    END
+    """,
+    # Index any rows that already exist
+    f"INSERT INTO {APPLICATION_SEARCH_TABLE}({APPLICATION_SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+for _statement in _APPLICATION_SEARCH_DDL:
+    event.listen(
+        LoanApplication.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+event.listen(
+    LoanApplication.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {APPLICATION_SEARCH_TABLE}").execute_if(
+        dialect="sqlite"
+    ),
+)
@@ -17,10 +17,15 @@ Security Architecture Alignment:
 - OWASP A07:2021 Identification and Authentication Failures → login_required
 """
 
+import re
+import secrets
 from functools import wraps
 
-from flask import flash, redirect, request, session, url_for
-from werkzeug.security import check_password_hash, generate_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from flask import abort, flash, g, redirect, request, session, url_for
+from sqlalchemy import exists, false, or_, true
+from werkzeug.security import check_password_hash
 
 from models import Role, User, db
 
@@ -29,19 +34,32 @@ from models import Role, User, db
 # ============================================================================
 
 
+# Argon2id parameters (OWASP interactive-login profile): 19 MiB memory,
+# 2 iterations, 1 lane. Targets ~25-50ms per hash on a typical server CPU,
+# versus ~200ms for Werkzeug's 600k-iteration PBKDF2 default, while remaining
+# memory-hard against GPU cracking. Re-benchmark before changing these.
+_password_hasher = PasswordHasher(
+    time_cost=2,
+    memory_cost=19456,
+    parallelism=1,
+    hash_len=32,
+    salt_len=16,
+)
+
+
 def hash_password(plain_password: str) -> str:
     """
-    Hash a plaintext password using Werkzeug's secure hashing.
+    Hash a plaintext password using Argon2id.
 
     Technical Details:
-    - Uses PBKDF2-SHA256 by default (Werkzeug 3.x)
+    - Argon2id (winner of the Password Hashing Competition, OWASP recommended)
     - Salt is automatically generated and embedded in hash
-    - Computational cost makes brute-force attacks infeasible
+    - Memory-hard cost parameters make GPU/ASIC brute-force infeasible
+      while keeping interactive login latency bounded (see _password_hasher)
 
     Security Note:
     NEVER store passwords in plaintext or use weak hashing (MD5, SHA1).
-    Real banking systems often use:
-    - Bcrypt or Argon2 (stronger than PBKDF2)
+    Real banking systems often also use:
     - Hardware Security Modules (HSMs) for key management
     - Regular password rotation policies
 
@@ -49,9 +67,9 @@ def hash_password(plain_password: str) -> str:
         plain_password: User's plaintext password
 
     Returns:
-        Hashed password string (includes salt and algorithm metadata)
+        Hashed password string (includes salt and algorithm parameters)
     """
-    return generate_password_hash(plain_password, method="pbkdf2:sha256")
+    return _password_hasher.hash(plain_password)
 
 
 def verify_password(plain_password: str, stored_hash: str) -> bool:
@@ -62,6 +80,10 @@ def verify_password(plain_password: str, stored_hash: str) -> bool:
     where attackers could determine password length or character matches
     based on response times.
 
+    Accepts Argon2id hashes as well as legacy Werkzeug PBKDF2 hashes, so
+    existing accounts keep working until they are rehashed on next login
+    (see password_needs_rehash).
+
     Args:
         plain_password: User-provided password to verify
         stored_hash: Hashed password from database
@@ -69,7 +91,53 @@ def verify_password(plain_password: str, stored_hash: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return check_password_hash(stored_hash, plain_password)
+    if not stored_hash.startswith("$argon2"):
+        # Legacy Werkzeug PBKDF2 hash
+        return check_password_hash(stored_hash, plain_password)
+
+    try:
+        return _password_hasher.verify(stored_hash, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+# Precomputed once at import: verified against when the username is unknown so
+# failed logins cost the same single Argon2 verification as real ones.
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
+
+def check_user_password(user, plain_password: str) -> bool:
+    """
+    Verify a login attempt for a possibly-missing user in constant time.
+
+    Security Feature: Without this, a request for an unknown username returns
+    immediately while a known username pays for a full hash verification,
+    leaking which usernames exist (username enumeration via timing).
+    Unknown users are verified against a dummy hash so both paths cost the same.
+
+    Args:
+        user: User object from the database, or None if username not found
+        plain_password: User-provided password to verify
+
+    Returns:
+        True only if the user exists and the password matches
+    """
+    if user is None:
+        verify_password(plain_password, _DUMMY_PASSWORD_HASH)
+        return False
+    return verify_password(plain_password, user.password_hash)
+
+
+def password_needs_rehash(stored_hash: str) -> bool:
+    """
+    Check whether a stored hash should be upgraded to the current parameters.
+
+    True for legacy PBKDF2 hashes and for Argon2 hashes created with
+    different cost parameters. Call after a successful verify_password().
+    """
+    if not stored_hash.startswith("$argon2"):
+        return True
+    return _password_hasher.check_needs_rehash(stored_hash)
 
 
 # ============================================================================
@@ -92,11 +160,18 @@ def get_current_user():
     - Add IP address validation (detect session hijacking)
     - Log all session activities for audit trail
 
+    The result is memoized on flask.g, so the decorators, the view and
+    the template context processor share one lookup per request.
+
     Returns:
         User object if authenticated, None otherwise
     """
+    if "user" in g:
+        return g.user
+
     user_id = session.get("user_id")
     if not user_id:
+        g.user = None
         return None
 
     # Fetch from database to ensure account is still active
@@ -107,6 +182,7 @@ def get_current_user():
         logout_user()  # Force logout if account was deactivated
         return None
 
+    g.user = user
     return user
 
 
@@ -153,6 +229,7 @@ def login_user(user: User):
     session["role"] = user.role
     session["branch_code"] = user.branch_code
     session["full_name"] = user.full_name
+    g.user = user
 
     # In production: also set session.permanent = True with PERMANENT_SESSION_LIFETIME
     # Update last login timestamp (audit trail)
@@ -174,6 +251,7 @@ def logout_user():
     - Log logout events (distinguish user-initiated vs timeout vs forced)
     """
     session.clear()
+    g.user = None
 
 
 # ============================================================================
@@ -256,6 +334,8 @@ def role_required(*allowed_roles):
     Returns:
         Decorator function that checks user's role
     """
+    # Built once at decoration time; the check itself is a set lookup
+    allowed = frozenset(allowed_roles)
 
     def decorator(fn):
         @wraps(fn)
@@ -265,7 +345,7 @@ def role_required(*allowed_roles):
                 flash("Authentication required.", "warning")
                 return redirect(url_for("login"))
 
-            if user.role not in allowed_roles:
+            if user.role not in allowed:
                 # SECURITY EVENT: Log this as potential privilege escalation attempt
                 flash(
                     f"Access Denied: Your role ({user.role}) is not authorized for this resource. "
@@ -341,6 +421,66 @@ def can_access_application(user: User, application) -> bool:
     return False
 
 
+def application_access_filter(user: User):
+    """
+    Return a SQL clause equivalent to can_access_application() for a user.
+
+    Lets a single-row fetch apply the authorization rule in the WHERE clause
+    instead of loading the row and deciding in Python.
+
+    Args:
+        user: Current User object
+
+    Returns:
+        SQLAlchemy boolean clause over LoanApplication columns
+    """
+    from models import LoanApplication
+
+    if user.role == Role.SUPER_ADMIN:
+        return true()
+
+    if user.role in (Role.BRANCH_HO, Role.BRANCH_OFFICER):
+        return LoanApplication.branch_code == user.branch_code
+
+    if user.role == Role.APPROVAL_EXPERT:
+        return or_(
+            LoanApplication.branch_code == user.branch_code,
+            LoanApplication.assigned_expert_id == user.id,
+        )
+
+    # Default deny
+    return false()
+
+
+def get_accessible_application(user: User, app_id: int):
+    """
+    Fetch a loan application only if the user is authorized to access it.
+
+    Existence and permission are resolved in one indexed query. Only when
+    that returns nothing does a cheap EXISTS probe tell "not found" (404)
+    apart from "access denied" (None, caller decides how to respond), so
+    denied requests never materialize the row.
+
+    Args:
+        user: Current User object
+        app_id: LoanApplication primary key
+
+    Returns:
+        LoanApplication if accessible, None if it exists but access is denied
+    """
+    from models import LoanApplication
+
+    application = LoanApplication.query.filter(
+        LoanApplication.id == app_id, application_access_filter(user)
+    ).first()
+
+    if application is None:
+        if not db.session.query(exists().where(LoanApplication.id == app_id)).scalar():
+            abort(404)
+
+    return application
+
+
 def get_accessible_applications_query(user: User):
     """
     Return a SQLAlchemy query filtered by user's access rights.
@@ -390,6 +530,12 @@ def get_accessible_applications_query(user: User):
 # ============================================================================
 
 
+# Compiled once at import; search input is sanitized on every list request
+SEARCH_MAX_LENGTH = 64
+_SEARCH_DISALLOWED_CHARS = re.compile(r"[^\w\s@.\-]")
+_LIKE_ESCAPE = str.maketrans({"%": "\\%", "_": "\\_", "\\": "\\\\"})
+
+
 def sanitize_search_input(search_term: str) -> str:
     """
     Sanitize user input for search functionality.
@@ -409,15 +555,20 @@ def sanitize_search_input(search_term: str) -> str:
     if not search_term:
         return ""
 
-    # Remove leading/trailing whitespace
-    cleaned = search_term.strip()
+    # Whitelist: word characters, whitespace and the separators used in
+    # references, emails and IDs (@ . -); everything else is dropped
+    cleaned = _SEARCH_DISALLOWED_CHARS.sub("", search_term).strip()
 
     # Limit length to prevent DoS via extremely long search terms
-    max_length = 100
-    if len(cleaned) > max_length:
-        cleaned = cleaned[:max_length]
-
-    # In production: could also strip special characters, HTML tags, etc.
     # For database search, ORM parameterization is the PRIMARY defense.
+    return cleaned[:SEARCH_MAX_LENGTH]
 
-    return cleaned
+
+def escape_like(term: str) -> str:
+    """
+    Escape LIKE wildcards so a term matches literally.
+
+    Use with ``column.ilike(f"%{escape_like(term)}%", escape="\\")``;
+    otherwise a search for "_" or "%" matches every row.
+    """
+    return term.translate(_LIKE_ESCAPE)
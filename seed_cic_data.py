@@ -302,8 +302,8 @@ def create_cic_customer(loan_application: LoanApplication, profile_type: str):
     )
 
     # Check if customer already exists
-    existing = CICCustomer.query.filter_by(
-        national_id=loan_application.national_id
+    existing = CICCustomer.query.filter(
+        CICCustomer.national_id_is(loan_application.national_id)
     ).first()
     if existing:
         print(f"  ⚠️  Customer already exists in CIC: {existing.national_id}")
@@ -652,6 +652,7 @@ def create_payment_history(
     on_time_payments = 0
     late_payments = 0
     missed_payments = 0
+    payment_records = []
 
     for month_offset in range(months_active):
         payment_date_due = account.disbursement_date + timedelta(
@@ -711,20 +712,23 @@ def create_payment_history(
             amount_due if payment_status != CICPaymentStatus.MISSED else Decimal(0)
         )
 
-        payment_record = CICPaymentHistory(
-            account_id=account.id,
-            payment_month=payment_date_due.month,
-            payment_year=payment_date_due.year,
-            payment_due_date=payment_date_due,
-            amount_due=amount_due,
-            amount_paid=amount_paid,
-            payment_date=payment_date_actual,
-            days_late=days_late,
-            payment_status=payment_status,
-            is_partial_payment=False,
-            is_settlement=False,
+        payment_records.append(
+            dict(
+                account_id=account.id,
+                payment_month=payment_date_due.month,
+                payment_year=payment_date_due.year,
+                payment_due_date=payment_date_due,
+                amount_due=amount_due,
+                amount_paid=amount_paid,
+                payment_date=payment_date_actual,
+                days_late=days_late,
+                payment_status=payment_status,
+                is_partial_payment=False,
+                is_settlement=False,
+            )
         )
-        db.session.add(payment_record)
+
+    CICPaymentHistory.bulk_load(payment_records)
 
     # Update account statistics
     account.total_payments_made = total_payments
@@ -934,10 +938,14 @@ def seed_cic_data():
     created_count = 0
     skipped_count = 0
 
+    # Look up existing CIC customers for all applicants in a few IN queries
+    existing_ids = set(
+        CICService.bulk_lookup([app.national_id for app in applications])
+    )
+
     for i, app in enumerate(applications, 1):
         # Check if already exists
-        existing = CICCustomer.query.filter_by(national_id=app.national_id).first()
-        if existing:
+        if app.national_id in existing_ids:
             skipped_count += 1
             continue
 
@@ -947,6 +955,7 @@ def seed_cic_data():
         # Create CIC profile
         try:
             create_cic_customer(app, profile_type)
+            existing_ids.add(app.national_id)
             created_count += 1
 
             if created_count % 50 == 0:
@@ -973,10 +982,12 @@ def calculate_all_credit_scores():
     customers = CICCustomer.query.all()
     print(f"🎯 Calculating credit scores for {len(customers)} customers...\n")
 
+    # Payment history is aggregated for everyone in one pass
+    results = CICService.calculate_credit_scores(customers)
+
     for i, customer in enumerate(customers, 1):
         try:
-            # Calculate score
-            result = CICService.calculate_credit_score(customer.national_id)
+            result = results[customer.id]
 
             # Update customer record
             customer.current_credit_score = result["score"]
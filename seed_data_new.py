@@ -6,8 +6,6 @@ Creates users, branches, and realistic loan applications with 3-tier approval wo
 import random
 from datetime import datetime, timedelta
 
-from werkzeug.security import generate_password_hash
-
 from app import app
 from models import (
     ApplicationGrade,
@@ -19,6 +17,7 @@ from models import (
     User,
     db,
 )
+from security import hash_password
 
 # ============================================================================
 # Configuration
@@ -141,10 +140,13 @@ def create_users():
     print("\n🏦 Creating users...")
     users_created = 0
 
+    # All demo users share one password - hash it once (hashing is slow by design)
+    default_password_hash = hash_password(DEFAULT_PASSWORD)
+
     # Create SUPER_ADMIN
     super_admin = User(
         username="superadmin",
-        password_hash=generate_password_hash(DEFAULT_PASSWORD),
+        password_hash=default_password_hash,
         full_name="System Administrator",
         branch_code="HEAD_OFFICE",
         role=Role.SUPER_ADMIN,
@@ -165,7 +167,7 @@ def create_users():
             full_name = f"Branch Officer {i} - {branch_name}"
             user = User(
                 username=username,
-                password_hash=generate_password_hash(DEFAULT_PASSWORD),
+                password_hash=default_password_hash,
                 full_name=full_name,
                 branch_code=branch_code,
                 role=Role.BRANCH_OFFICER,
@@ -181,7 +183,7 @@ def create_users():
             full_name = f"Approval Expert {i} - {branch_name}"
             user = User(
                 username=username,
-                password_hash=generate_password_hash(DEFAULT_PASSWORD),
+                password_hash=default_password_hash,
                 full_name=full_name,
                 branch_code=branch_code,
                 role=Role.APPROVAL_EXPERT,
@@ -197,7 +199,7 @@ def create_users():
             full_name = f"Branch HO {i} - {branch_name}"
             user = User(
                 username=username,
-                password_hash=generate_password_hash(DEFAULT_PASSWORD),
+                password_hash=default_password_hash,
                 full_name=full_name,
                 branch_code=branch_code,
                 role=Role.BRANCH_HO,
@@ -409,7 +411,7 @@ def assign_workflow_status(app, branch_users):
 def create_applications():
     """Create loan applications for all branches."""
     print("\n📝 Creating loan applications...")
-    apps_created = 0
+    applications = []
 
     # Get all users by branch
     all_users = User.query.all()
@@ -439,12 +441,14 @@ def create_applications():
             app = generate_realistic_application(branch_code, creator, days_ago)
             assign_workflow_status(app, branch_users)
 
-            db.session.add(app)
-            apps_created += 1
+            applications.append(app)
 
         print(f"  ✅ Created {num_apps} applications for {branch_code}")
 
+    # One batched INSERT pass instead of a unit-of-work flush per object
+    db.session.bulk_save_objects(applications)
     db.session.commit()
+    apps_created = len(applications)
     print(f"\n✅ Total applications created: {apps_created}")
     return apps_created
 